@@ -3,20 +3,39 @@
 MCP Weather Server - Simple temperature lookup via OpenMeteo API
 """
 import httpx
-from mcp.server import Server
-from mcp.types import Tool, TextContent
 from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import Response, StreamingResponse
 from starlette.routing import Route
 import uvicorn
-import json
-from typing import Any
+import orjson
+from typing import Any, Awaitable, Callable
 import asyncio
+import gzip
+import logging
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+
+log = logging.getLogger("weather-server")
 
 # Fixed location: 51.836316614873176, 5.79300494667676
 LATITUDE = 51.836316614873176
 LONGITUDE = 5.79300494667676
+# Formatted once for tool descriptions and the info page
+LOCATION_TEXT = f"{LATITUDE}, {LONGITUDE}"
+
+# Shared OpenMeteo client, created on app startup and reused across tool calls
+CLIENT: httpx.AsyncClient | None = None
+
+# Keep idle connections for 15s (httpx default is 5s) so clients polling
+# every 10-30s reuse the pooled connection instead of a new TLS handshake
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=15.0)
+
+# Tight timeouts bound tool-call latency when OpenMeteo hangs; the result
+# cache then serves the last good answer instead
+HTTP_TIMEOUT = httpx.Timeout(connect=1.0, read=2.0, write=1.0, pool=1.0)
 
 # Weather code descriptions (WMO codes)
 WEATHER_CODES = {
@@ -46,372 +65,451 @@ WEATHER_CODES = {
     99: "Onweer met zware hagel"
 }
 
+# Dutch compass point for every whole degree (0-359)
+_COMPASS_POINTS = ["N", "NO", "O", "ZO", "Z", "ZW", "W", "NW"]
+WIND_DIRECTIONS = tuple(_COMPASS_POINTS[int((d + 22.5) / 45) % 8] for d in range(360))
+
+# WEATHER_CODES as a flat table indexed by code (WMO codes are 0-99)
+_WMO_TABLE = tuple(WEATHER_CODES.get(i, "Onbekend") for i in range(100))
+
 def get_weather_description(code: int) -> str:
     """Get Dutch weather description from WMO code"""
+    if type(code) is int and 0 <= code < 100:
+        return _WMO_TABLE[code]
+    # Anything else (e.g. null for missing model data) goes through the dict
     return WEATHER_CODES.get(code, "Onbekend")
 
-mcp_server = Server("weather-server")
-
-@mcp_server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools"""
-    return [
-        Tool(
-            name="get_temperature",
-            description=f"Get current temperature for location ({LATITUDE}, {LONGITUDE}) via OpenMeteo API",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        )
-    ]
-
-@mcp_server.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[TextContent]:
-    """Handle tool calls"""
-    if name != "get_temperature":
-        raise ValueError(f"Unknown tool: {name}")
-
-    # Call OpenMeteo API
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://api.open-meteo.com/v1/forecast",
-            params={
-                "latitude": LATITUDE,
-                "longitude": LONGITUDE,
-                "current": "temperature_2m",
-                "timezone": "Europe/Amsterdam"
-            }
-        )
-        response.raise_for_status()
-        data = response.json()
-
-    # Extract temperature
-    temp = data["current"]["temperature_2m"]
-    unit = data["current_units"]["temperature_2m"]
-
-    result = f"Current temperature: {temp}{unit}"
+def format_current_weather(current: dict) -> str:
+    """Format the OpenMeteo 'current' block as Dutch text"""
+    wind_dir_text = WIND_DIRECTIONS[int(current["wind_direction_10m"]) % 360]
 
-    return [TextContent(
-        type="text",
-        text=result
-    )]
-
-# SSE message handling
-message_queue: asyncio.Queue = asyncio.Queue()
-
-async def handle_sse_endpoint(request: Request):
-    """Handle SSE endpoint - streams events to client or handles POST messages"""
-
-    # Handle POST requests (MCP messages)
-    if request.method == "POST":
-        try:
-            data = await request.json()
-            method = data.get("method")
-            print(f"Received MCP request: {method}")
-
-            # Handle different MCP methods
-            if method == "initialize":
-                response_data = {
-                    "jsonrpc": "2.0",
-                    "id": data.get("id"),
-                    "result": {
-                        "protocolVersion": "2025-11-25",
-                        "capabilities": {
-                            "tools": {}
-                        },
-                        "serverInfo": {
-                            "name": "weather-server",
-                            "version": "2.0.0"
-                        }
-                    }
-                }
-
-            elif method == "tools/list":
-                response_data = {
-                    "jsonrpc": "2.0",
-                    "id": data.get("id"),
-                    "result": {
-                        "tools": [
-                            {
-                                "name": "get_temperature",
-                                "description": f"Get current temperature for location ({LATITUDE}, {LONGITUDE}) via OpenMeteo API",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {},
-                                    "required": []
-                                }
-                            },
-                            {
-                                "name": "get_current_weather",
-                                "description": f"Get detailed current weather including temperature, humidity, wind, and precipitation for location ({LATITUDE}, {LONGITUDE})",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {},
-                                    "required": []
-                                }
-                            },
-                            {
-                                "name": "get_forecast",
-                                "description": f"Get 5-day weather forecast for location ({LATITUDE}, {LONGITUDE})",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {},
-                                    "required": []
-                                }
-                            }
-                        ]
-                    }
-                }
-
-            elif method == "tools/call":
-                tool_name = data.get("params", {}).get("name")
-                print(f"Calling tool: {tool_name}")
-
-                if tool_name == "get_temperature":
-                    # Call OpenMeteo API - simple temperature
-                    async with httpx.AsyncClient() as client:
-                        api_response = await client.get(
-                            "https://api.open-meteo.com/v1/forecast",
-                            params={
-                                "latitude": LATITUDE,
-                                "longitude": LONGITUDE,
-                                "current": "temperature_2m",
-                                "timezone": "Europe/Amsterdam"
-                            }
-                        )
-                        api_response.raise_for_status()
-                        api_data = api_response.json()
-
-                    temp = api_data["current"]["temperature_2m"]
-                    unit = api_data["current_units"]["temperature_2m"]
-                    result_text = f"Current temperature: {temp}{unit}"
-
-                    response_data = {
-                        "jsonrpc": "2.0",
-                        "id": data.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": result_text
-                                }
-                            ]
-                        }
-                    }
-
-                elif tool_name == "get_current_weather":
-                    # Call OpenMeteo API - detailed weather
-                    async with httpx.AsyncClient() as client:
-                        api_response = await client.get(
-                            "https://api.open-meteo.com/v1/forecast",
-                            params={
-                                "latitude": LATITUDE,
-                                "longitude": LONGITUDE,
-                                "current": "temperature_2m,apparent_temperature,relative_humidity_2m,precipitation,weather_code,wind_speed_10m,wind_direction_10m",
-                                "timezone": "Europe/Amsterdam"
-                            }
-                        )
-                        api_response.raise_for_status()
-                        api_data = api_response.json()
-
-                    current = api_data["current"]
-
-                    # Wind direction conversion
-                    wind_dir = current["wind_direction_10m"]
-                    directions = ["N", "NO", "O", "ZO", "Z", "ZW", "W", "NW"]
-                    wind_dir_text = directions[int((wind_dir + 22.5) / 45) % 8]
-
-                    result_text = f"""Actueel weer:
+    return f"""Actueel weer:
 🌡️ Temperatuur: {current['temperature_2m']}°C (voelt als {current['apparent_temperature']}°C)
 💧 Luchtvochtigheid: {current['relative_humidity_2m']}%
 🌧️ Neerslag: {current['precipitation']} mm
 💨 Wind: {current['wind_speed_10m']} km/u {wind_dir_text}
 ☁️ Conditie: {get_weather_description(current['weather_code'])}"""
 
-                    response_data = {
-                        "jsonrpc": "2.0",
-                        "id": data.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": result_text
-                                }
-                            ]
-                        }
-                    }
-
-                elif tool_name == "get_forecast":
-                    # Call OpenMeteo API - 5-day forecast
-                    async with httpx.AsyncClient() as client:
-                        api_response = await client.get(
-                            "https://api.open-meteo.com/v1/forecast",
-                            params={
-                                "latitude": LATITUDE,
-                                "longitude": LONGITUDE,
-                                "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,weather_code",
-                                "timezone": "Europe/Amsterdam",
-                                "forecast_days": 5
-                            }
-                        )
-                        api_response.raise_for_status()
-                        api_data = api_response.json()
-
-                    daily = api_data["daily"]
-                    forecast_lines = ["5-daagse weersverwachting:\n"]
-
-                    for i in range(5):
-                        date = daily["time"][i]
-                        temp_max = daily["temperature_2m_max"][i]
-                        temp_min = daily["temperature_2m_min"][i]
-                        precip = daily["precipitation_sum"][i]
-                        weather = get_weather_description(daily["weather_code"][i])
-
-                        forecast_lines.append(
-                            f"{date}: {weather}, {temp_min}°C - {temp_max}°C, neerslag: {precip}mm"
-                        )
-
-                    result_text = "\n".join(forecast_lines)
-
-                    response_data = {
-                        "jsonrpc": "2.0",
-                        "id": data.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": result_text
-                                }
-                            ]
-                        }
-                    }
-
-                else:
-                    response_data = {
-                        "jsonrpc": "2.0",
-                        "id": data.get("id"),
-                        "error": {
-                            "code": -32601,
-                            "message": f"Unknown tool: {tool_name}"
-                        }
-                    }
-
-            else:
-                response_data = {
-                    "jsonrpc": "2.0",
-                    "id": data.get("id"),
-                    "error": {
-                        "code": -32601,
-                        "message": f"Unknown method: {method}"
-                    }
-                }
-
-            return Response(
-                content=json.dumps(response_data),
-                media_type="application/json"
-            )
-        except Exception as e:
-            print(f"Error handling POST: {e}")
-            import traceback
-            traceback.print_exc()
-            return Response(
-                content=json.dumps({
-                    "jsonrpc": "2.0",
-                    "id": data.get("id") if "data" in locals() else None,
-                    "error": {
-                        "code": -32603,
-                        "message": str(e)
-                    }
-                }),
-                status_code=500,
-                media_type="application/json"
-            )
-
-    # Handle GET requests (SSE stream)
-    async def event_stream():
+def format_forecast(daily: dict) -> str:
+    """Format the OpenMeteo 'daily' block as a Dutch 5-day forecast"""
+    forecast_lines = ["5-daagse weersverwachting:\n"]
+
+    for i in range(5):
+        date = daily["time"][i]
+        temp_max = daily["temperature_2m_max"][i]
+        temp_min = daily["temperature_2m_min"][i]
+        precip = daily["precipitation_sum"][i]
+        weather = get_weather_description(daily["weather_code"][i])
+
+        forecast_lines.append(
+            f"{date}: {weather}, {temp_min}°C - {temp_max}°C, neerslag: {precip}mm"
+        )
+
+    return "\n".join(forecast_lines)
+
+# Every query parameter is fixed, so URL-encode the forecast query once
+_FORECAST_URL = "/v1/forecast?" + str(httpx.QueryParams({
+    "latitude": LATITUDE,
+    "longitude": LONGITUDE,
+    "current": "temperature_2m,apparent_temperature,relative_humidity_2m,precipitation,weather_code,wind_speed_10m,wind_direction_10m",
+    "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,weather_code",
+    "timezone": "Europe/Amsterdam",
+    "forecast_days": 5
+}))
+
+# Combined OpenMeteo payload (current + daily) shared by all tools:
+# (data, expires_at, etag, last_modified)
+FETCH_TTL = 60.0
+_fetch_cache: tuple[dict, float, str | None, str | None] | None = None
+
+async def _fetch_all() -> dict:
+    """Fetch current weather and 5-day forecast in one OpenMeteo request, cached for FETCH_TTL seconds.
+
+    Once expired, the cached payload is revalidated with If-None-Match /
+    If-Modified-Since so an unchanged forecast comes back as an empty 304.
+    """
+    global _fetch_cache
+    now = time.monotonic()
+    headers = {}
+    if _fetch_cache is not None:
+        data, expires_at, etag, last_modified = _fetch_cache
+        if now < expires_at:
+            return data
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response = await CLIENT.get(_FORECAST_URL, headers=headers)
+    if response.status_code == 304 and _fetch_cache is not None:
+        _fetch_cache = (_fetch_cache[0], now + FETCH_TTL, _fetch_cache[2], _fetch_cache[3])
+        return _fetch_cache[0]
+
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+    _fetch_cache = (data, now + FETCH_TTL, response.headers.get("etag"), response.headers.get("last-modified"))
+    return data
+
+async def temperature_text() -> str:
+    """Current temperature as short text"""
+    api_data = await _fetch_all()
+    temp = api_data["current"]["temperature_2m"]
+    unit = api_data["current_units"]["temperature_2m"]
+    return f"Current temperature: {temp}{unit}"
+
+async def current_weather_text() -> str:
+    """Detailed current weather as Dutch text"""
+    api_data = await _fetch_all()
+    return format_current_weather(api_data["current"])
+
+async def forecast_text() -> str:
+    """5-day forecast as Dutch text"""
+    api_data = await _fetch_all()
+    return format_forecast(api_data["daily"])
+
+async def weather_report_text() -> str:
+    """Current weather followed by the 5-day forecast"""
+    api_data = await _fetch_all()
+    return format_current_weather(api_data["current"]) + "\n\n" + format_forecast(api_data["daily"])
+
+TOOL_HANDLERS: dict[str, Callable[[], Awaitable[str]]] = {
+    "get_temperature": temperature_text,
+    "get_current_weather": current_weather_text,
+    "get_forecast": forecast_text,
+    "get_weather_report": weather_report_text
+}
+
+# Formatted tool results, stored JSON-encoded: tool name -> (expires_at, text_json)
+TOOL_TTL = {
+    "get_temperature": 60.0,
+    "get_current_weather": 60.0,
+    "get_forecast": 600.0,
+    "get_weather_report": 60.0
+}
+# After a failed rebuild the stale text is served for this long before OpenMeteo is tried again
+RETRY_BACKOFF = 10.0
+_result_cache: dict[str, tuple[float, bytes]] = {}
+_result_lock = asyncio.Lock()
+
+def _fresh_result(tool_name: str) -> bytes | None:
+    """Cached JSON-encoded text for a tool if it has not expired yet"""
+    entry = _result_cache.get(tool_name)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry[1]
+    return None
+
+async def _cached_result(tool_name: str, build: Callable[[], Awaitable[str]]) -> bytes:
+    """Return the cached JSON-encoded text for a tool, rebuilding it when expired.
+
+    The text is encoded once per rebuild, so cache hits only splice in the
+    request id. Falls back to the last cached text if the upstream call fails,
+    and keeps serving it for RETRY_BACKOFF seconds before the next attempt.
+    """
+    text_json = _fresh_result(tool_name)
+    if text_json is not None:
+        return text_json
+
+    # One rebuild at a time, so concurrent misses share a single upstream fetch
+    async with _result_lock:
+        entry = _result_cache.get(tool_name)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
         try:
-            while True:
-                # Wait for messages
-                message = await asyncio.wait_for(message_queue.get(), timeout=30.0)
-                yield f"data: {json.dumps(message)}\n\n"
-        except asyncio.TimeoutError:
-            # Send keepalive
-            yield ": keepalive\n\n"
+            text_json = orjson.dumps(await build())
         except Exception as e:
-            print(f"SSE error: {e}")
-            return
+            if entry is None:
+                raise
+            log.warning("OpenMeteo call failed for %s, serving cached result: %s", tool_name, e)
+            # Push the expiry out so queued waiters and later calls serve stale
+            # text too, instead of each retrying (and timing out) in turn
+            _result_cache[tool_name] = (time.monotonic() + RETRY_BACKOFF, entry[1])
+            return entry[1]
+        _result_cache[tool_name] = (time.monotonic() + TOOL_TTL[tool_name], text_json)
+        return text_json
+
+# Static JSON-RPC results, encoded once at import time
+TOOLS = [
+    {
+        "name": "get_temperature",
+        "description": f"Get current temperature for location ({LOCATION_TEXT}) via OpenMeteo API",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "get_current_weather",
+        "description": f"Get detailed current weather including temperature, humidity, wind, and precipitation for location ({LOCATION_TEXT})",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "get_forecast",
+        "description": f"Get 5-day weather forecast for location ({LOCATION_TEXT})",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "get_weather_report",
+        "description": f"Get current weather and 5-day forecast in one call for location ({LOCATION_TEXT})",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    }
+]
+
+_INITIALIZE_RESULT_JSON = orjson.dumps({
+    "protocolVersion": "2025-11-25",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "weather-server",
+        "version": "2.0.0"
+    }
+})
+_TOOLS_LIST_RESULT_JSON = orjson.dumps({"tools": TOOLS})
+
+# JSON-RPC response templates; only the id and payload are encoded per request
+_RESULT_TMPL = b'{"jsonrpc":"2.0","id":%s,"result":%s}'
+_TOOL_RESULT_TMPL = b'{"jsonrpc":"2.0","id":%s,"result":{"content":[{"type":"text","text":%s}]}}'
+_ERROR_TMPL = b'{"jsonrpc":"2.0","id":%s,"error":{"code":%d,"message":%s}}'
+
+def _result_envelope(req_id: Any, result_json: bytes) -> bytes:
+    """Wrap a pre-encoded result in a JSON-RPC response"""
+    return _RESULT_TMPL % (orjson.dumps(req_id), result_json)
+
+def _build_text_response(req_id: Any, text_json: bytes) -> bytes:
+    """JSON-RPC tool result with a single, already JSON-encoded, text content item"""
+    return _TOOL_RESULT_TMPL % (orjson.dumps(req_id), text_json)
+
+def _build_error_response(req_id: Any, code: int, message: str) -> bytes:
+    """JSON-RPC error response"""
+    return _ERROR_TMPL % (orjson.dumps(req_id), code, orjson.dumps(message))
+
+# Handlers return the response body directly when no I/O is needed, and an
+# awaitable only when an upstream fetch is required
+def _handle_initialize(data: dict) -> bytes:
+    """MCP initialize handshake"""
+    return _result_envelope(data.get("id"), _INITIALIZE_RESULT_JSON)
+
+def _handle_tools_list(data: dict) -> bytes:
+    """List available tools"""
+    return _result_envelope(data.get("id"), _TOOLS_LIST_RESULT_JSON)
+
+def _handle_tools_call(data: dict) -> bytes | Awaitable[bytes]:
+    """Run a tool and return its text result"""
+    params = data.get("params", {})
+    if not isinstance(params, dict):
+        return _build_error_response(data.get("id"), -32602, "Invalid params")
+    tool_name = params.get("name")
+
+    # Reject unknown (or non-string) tool names before doing any work
+    build = TOOL_HANDLERS.get(tool_name) if isinstance(tool_name, str) else None
+    if build is None:
+        return _build_error_response(data.get("id"), -32601, f"Unknown tool: {tool_name}")
+
+    log.debug("Calling tool: %s", tool_name)
+    text_json = _fresh_result(tool_name)
+    if text_json is not None:
+        return _build_text_response(data.get("id"), text_json)
+    return _call_tool_uncached(data.get("id"), tool_name, build)
+
+async def _call_tool_uncached(req_id: Any, tool_name: str, build: Callable[[], Awaitable[str]]) -> bytes:
+    """Slow path of tools/call: rebuild the tool result through the cache"""
+    return _build_text_response(req_id, await _cached_result(tool_name, build))
+
+def _method_not_found(data: dict, method: Any) -> bytes:
+    """JSON-RPC error for an unknown method"""
+    return _build_error_response(data.get("id"), -32601, f"Unknown method: {method}")
+
+METHOD_HANDLERS: dict[str, Callable[[dict], bytes | Awaitable[bytes]]] = {
+    "initialize": _handle_initialize,
+    "tools/list": _handle_tools_list,
+    "tools/call": _handle_tools_call
+}
+
+# JSON-RPC messages are tiny; anything larger is rejected with 413
+MAX_BODY_SIZE = 64 * 1024
+
+async def _read_capped_body(request: Request) -> bytes | None:
+    """Read the request body, or return None as soon as it passes MAX_BODY_SIZE"""
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_BODY_SIZE:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+class ORJSONResponse(Response):
+    """JSON response for bodies already encoded with orjson by the JSON-RPC templates"""
+    media_type = "application/json"
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+# SSE constants, shared by every stream (Starlette copies the headers)
+_SSE_KEEPALIVE = b": keepalive\n\n"
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+}
+
+async def handle_sse_get(_request: Request):
+    """SSE event stream (MCP) - a keepalive heartbeat for connected clients"""
+    async def event_stream():
+        while True:
+            await asyncio.sleep(15.0)
+            yield _SSE_KEEPALIVE
 
     return StreamingResponse(
         event_stream(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
+        headers=_SSE_HEADERS
     )
 
 async def handle_messages(request: Request):
-    """Handle incoming MCP messages via POST"""
+    """Handle incoming MCP JSON-RPC messages via POST"""
+    data = None
     try:
-        data = await request.json()
-        print(f"Received message: {data}")
-
-        # Simple response for now
-        response_data = {
-            "jsonrpc": "2.0",
-            "id": data.get("id"),
-            "result": {"status": "ok"}
-        }
+        # Refuse oversized bodies, by declared length before reading and while
+        # streaming bodies sent without one (chunked)
+        if int(request.headers.get("content-length", 0)) > MAX_BODY_SIZE:
+            return Response(status_code=413)
+        body = await _read_capped_body(request)
+        if body is None:
+            return Response(status_code=413)
 
-        return Response(
-            content=json.dumps(response_data),
-            media_type="application/json"
-        )
+        try:
+            data = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Malformed or empty JSON is a client error, not a server failure
+            return ORJSONResponse(_build_error_response(None, -32700, "Parse error"))
+        # Batches and bare JSON values are not supported JSON-RPC requests here
+        if not isinstance(data, dict):
+            return ORJSONResponse(_build_error_response(None, -32600, "Invalid Request"))
+        method = data.get("method")
+
+        # Notifications (no id, e.g. notifications/initialized) get no JSON-RPC
+        # reply, just an empty 202 ack
+        if "id" not in data:
+            log.debug("Received MCP notification: %s", method)
+            return Response(status_code=202)
+
+        # Reject unknown (or non-string) methods before doing any work
+        handler = METHOD_HANDLERS.get(method) if isinstance(method, str) else None
+        if handler is None:
+            return ORJSONResponse(_method_not_found(data, method))
+
+        log.debug("Received MCP request: %s", method)
+        content = handler(data)
+        if not isinstance(content, bytes):
+            content = await content
+        return ORJSONResponse(content)
     except Exception as e:
-        print(f"Error handling message: {e}")
-        return Response(
-            content=json.dumps({"error": str(e)}),
-            status_code=500,
-            media_type="application/json"
+        log.exception("Error handling POST")
+        return ORJSONResponse(
+            _build_error_response(data.get("id") if isinstance(data, dict) else None, -32603, str(e)),
+            status_code=500
         )
 
-async def health_check(_request: Request):
-    """Health check endpoint"""
-    return Response("OK", status_code=200)
-
-async def root(_request: Request):
-    """Root endpoint with info"""
-    info = """MCP Weather Server v2.0
+# Static bodies for root/health, encoded once at import time
+_ROOT_INFO = f"""MCP Weather Server v2.0
 
 Available endpoints:
 - GET / - This info page
 - GET /health - Health check
 - GET /sse - SSE event stream (MCP)
-- POST /messages - MCP message endpoint
+- POST /sse - MCP JSON-RPC endpoint (initialize, tools/list, tools/call)
+- POST /messages - MCP JSON-RPC endpoint (same as POST /sse)
 
-Location: 51.836316614873176, 5.79300494667676 (Nederland)
+Location: {LOCATION_TEXT} (Nederland)
 
 Available Tools:
 - get_temperature - Simpele temperatuur opvragen
 - get_current_weather - Uitgebreid actueel weer (temp, vocht, wind, neerslag)
 - get_forecast - 5-daagse weersverwachting
+- get_weather_report - Actueel weer en 5-daagse verwachting in één keer
 
 Status: Running
 """
-    return Response(info, media_type="text/plain")
+_ROOT_BYTES = _ROOT_INFO.encode("utf-8")
+_ROOT_GZIP = gzip.compress(_ROOT_BYTES, compresslevel=9)
+_OK_BYTES = b"OK"
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header lists gzip without q=0"""
+    for token in accept_encoding.split(","):
+        coding, _, params = token.partition(";")
+        if coding.strip().lower() != "gzip":
+            continue
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+async def health_check(_request: Request):
+    """Health check endpoint"""
+    return Response(_OK_BYTES, status_code=200)
+
+async def root(request: Request):
+    """Root endpoint with info, gzipped when the client accepts it"""
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return Response(
+            _ROOT_GZIP,
+            media_type="text/plain; charset=utf-8",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(_ROOT_BYTES, media_type="text/plain; charset=utf-8", headers={"Vary": "Accept-Encoding"})
+
+@asynccontextmanager
+async def lifespan(_app: Starlette):
+    """Open the shared OpenMeteo client on startup and close it on shutdown"""
+    global CLIENT
+    # HTTP/2 (h2 via httpx[http2]) multiplexes concurrent tool calls over one connection;
+    # with brotli installed httpx also advertises and decodes br-compressed responses
+    CLIENT = httpx.AsyncClient(
+        base_url="https://api.open-meteo.com",
+        http2=True,
+        timeout=HTTP_TIMEOUT,
+        limits=HTTP_LIMITS
+    )
+    try:
+        yield
+    finally:
+        await CLIENT.aclose()
 
 # Create Starlette app
 app = Starlette(
-    debug=True,
+    debug=os.environ.get("WEATHER_DEBUG") == "1",
+    lifespan=lifespan,
     routes=[
         Route("/", root, methods=["GET"]),
-        Route("/sse", handle_sse_endpoint, methods=["GET", "POST"]),
+        Route("/sse", handle_sse_get, methods=["GET"]),
+        # OpenWebUI (MCP Streamable HTTP) POSTs JSON-RPC to the configured /sse URL
+        Route("/sse", handle_messages, methods=["POST"]),
         Route("/messages", handle_messages, methods=["POST"]),
         Route("/health", health_check, methods=["GET"]),
     ]
 )
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    logging.basicConfig(level=logging.INFO)
+    # uvloop is POSIX-only; fall back to the default asyncio loop on Windows
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop=loop, http="httptools", ws="none", log_level="warning", access_log=False)